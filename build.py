@@ -1,15 +1,48 @@
 import os
-from os.path import isdir, join, abspath, dirname, relpath, isfile, splitext
+from os.path import isdir, join, abspath, basename, dirname, normpath, relpath, isfile, splitext
+import errno
 import sys
+import hashlib
+from collections import deque
 import logging
 import shutil
-import glob
+import shlex
 import re
 import zipfile
+import zlib
+import concurrent.futures
 import subprocess
+import threading
+import time
 import json
 import argparse
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Linux ioctl(FICLONE): copy-on-write clone on btrfs/xfs and friends.
+_FICLONE = 0x40049409
+
+# isal provides SIMD-accelerated deflate/crc32 with the zlib API; use it
+# when installed, otherwise stick with the stdlib.
+try:
+    from isal import isal_zlib as _zlib
+except ImportError:
+    _zlib = zlib
+
+# blake3 hashes far faster than hashlib.sha256 (SIMD plus internal
+# threading); the fingerprints are cache keys, not security, so any
+# strong hash will do — fall back to sha256 when it is not installed.
+try:
+    from blake3 import blake3
+
+    def _new_hash():
+        return blake3(max_threads=blake3.AUTO)
+except ImportError:
+    _new_hash = hashlib.sha256
+
 ROOT_DIR = abspath(dirname(__file__))
 BUILD_DIR = join(ROOT_DIR, "build")
 LOG_DIR = join(ROOT_DIR, "logs")
@@ -18,19 +51,166 @@ FILE_LOG_FORMAT = "[%(asctime)s][%(name)s][%(levelname)s]: %(message)s"
 CONSOLE_LOG_FORMAT = "[%(name)s][%(levelname)s]: %(message)s"
 DATE_FORMAT = "%Y-%b-%d %H:%M:%S"
 LOG_LEVEL = logging.DEBUG
-REVISION_DIR = BUILD_DIR
 REVISION_FILENAME = "revision.txt"
-REVISION_PATH = join(BUILD_DIR, REVISION_FILENAME)
+MANIFEST_PATH = join(BUILD_DIR, ".manifest.json")
+ZIP_CACHE_DIR = join(BUILD_DIR, ".cache")
 MOD_DIR = join(ROOT_DIR, "mods")
 BIN_DIR = join(ROOT_DIR, "bin")
 
+def _walk_fast(root, name_regex, recursive=True):
+    # os.scandir fills DirEntry.is_dir from the readdir buffer, so this
+    # walks the tree without issuing a separate stat per entry the way
+    # glob/os.walk do. Missing roots yield nothing, matching glob.glob.
+    if isinstance(name_regex, str):
+        name_regex = re.compile(name_regex, re.IGNORECASE)
+    queue = deque((root,))
+    while queue:
+        try:
+            with os.scandir(queue.popleft()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            queue.append(entry.path)
+                    elif name_regex.search(entry.name):
+                        yield entry.path
+        except FileNotFoundError:
+            continue
+
+
+_walk_cache = {}
+
+def _list_files(root, name_regex, recursive=True):
+    # Memoize walk results so steps that scan the same tree within one
+    # build do not repeat the directory syscalls. The root's mtime is
+    # part of the entry so a tree modified mid-build is rescanned.
+    key = (root, name_regex, recursive)
+    mtime = os.stat(root).st_mtime_ns if isdir(root) else None
+    cached = _walk_cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    files = list(_walk_fast(root, name_regex, recursive))
+    _walk_cache[key] = (mtime, files)
+    return files
+
+
+def _file_digest(path):
+    h = _new_hash()
+    with open(path, "rb") as file:
+        while chunk := file.read(1 << 20):
+            h.update(chunk)
+    return h.digest()
+
+
+def _link_or_copy(src, dst):
+    if isfile(dst):
+        os.unlink(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _fast_copy(src, dst):
+    # Copy with the same semantics as shutil.copy2, but move the data
+    # kernel-side with os.sendfile where available instead of a userspace
+    # read/write loop.
+    if not hasattr(os, "sendfile"):
+        shutil.copy2(src, dst)
+        return
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        st = os.fstat(src_fd)
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, st.st_mode)
+        try:
+            cloned = False
+            if fcntl is not None:
+                try:
+                    # A reflink clone shares extents instead of moving
+                    # data: O(1) regardless of file size. Refused on
+                    # filesystems without CoW or across devices.
+                    fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+                    cloned = True
+                except OSError:
+                    pass
+            try:
+                offset = 0
+                while not cloned and offset < st.st_size:
+                    sent = os.sendfile(dst_fd, src_fd, offset, st.st_size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            except OSError as e:
+                # Some filesystems refuse sendfile; fall back to a plain copy.
+                if e.errno not in (errno.ENOSYS, errno.EINVAL):
+                    raise
+                os.lseek(src_fd, 0, os.SEEK_SET)
+                os.ftruncate(dst_fd, 0)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+                with open(src_fd, "rb", closefd=False) as fsrc:
+                    with open(dst_fd, "wb", closefd=False) as fdst:
+                        shutil.copyfileobj(fsrc, fdst)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(src, dst)
+
+
+class IncrementalManifest:
+    # Tracks (st_mtime_ns, st_size) per destination file so unchanged
+    # sources can be skipped on the next build instead of re-copied.
+    def __init__(self, logger, path):
+        self.path = path
+        self._logger = logger
+        self._previous = {}
+        self._current = {}
+        if isfile(path):
+            try:
+                with open(path, "r") as file:
+                    self._previous = json.load(file)
+            except (OSError, json.JSONDecodeError):
+                self._logger.warning("Discarding unreadable manifest: {}".format(path))
+                self._previous = {}
+
+    def is_unchanged(self, src, dest):
+        st = os.stat(src)
+        entry = [st.st_mtime_ns, st.st_size]
+        if self._previous.get(dest) != entry:
+            return False
+        # copystat gives every copy its source's mtime, so a destination
+        # touched out-of-band no longer matches and gets re-copied
+        # instead of being skipped forever.
+        try:
+            if os.stat(dest).st_mtime_ns != st.st_mtime_ns:
+                return False
+        except FileNotFoundError:
+            return False
+        self._current[dest] = entry
+        return True
+
+    def record(self, src, dest):
+        st = os.stat(src)
+        self._current[dest] = [st.st_mtime_ns, st.st_size]
+
+    def finalize(self):
+        # Destinations recorded last build but not this one have lost
+        # their source, so remove them before persisting the new state.
+        for dest in self._previous:
+            if dest not in self._current and isfile(dest):
+                self._logger.info("Deleting stale file {}".format(dest))
+                os.unlink(dest)
+        with open(self.path, "w") as file:
+            json.dump(self._current, file)
+
+
 class BuildStep:
+    __slots__ = ("name", "result", "stop_on_fail", "_logger")
     _ID = 0
     def __init__(self, logger, name=None, stop_on_fail=True):
         self.name = name
         self.result = False
+        self.stop_on_fail = stop_on_fail
         self._logger = logger
-        self._stop_on_fail = stop_on_fail
         if name is None:
             self.name = "BuildStep_{:02}".format(BuildStep._ID)
             BuildStep._ID += 1
@@ -39,11 +219,27 @@ class BuildStep:
         pass
         
 class GenericBuildStep(BuildStep):
+    __slots__ = ("execute",)
     def __init__(self, logger, callback, name=None, stop_on_fail=True):
         super().__init__(logger, name=name, stop_on_fail=stop_on_fail)
         self.execute = callback
 
+class CommandLineBuildStep(BuildStep):
+    __slots__ = ("command",)
+    def __init__(self, logger, command, **kwargs):
+        super().__init__(logger, **kwargs)
+        self.command = command
+
+    def execute(self):
+        # Exec the command directly instead of going through a shell;
+        # a string command is split once up front.
+        command = shlex.split(self.command) if isinstance(self.command, str) else self.command
+        self._logger.info("Running {}".format(command))
+        completed = subprocess.run(command, check=False, close_fds=True)
+        self.result = completed.returncode
+
 class CleanBuildStep(BuildStep):
+    __slots__ = ("dir",)
     def __init__(self, logger, dir_, **kwargs):
         super().__init__(logger, **kwargs)
         self.dir = dir_
@@ -51,59 +247,200 @@ class CleanBuildStep(BuildStep):
     def execute(self):
         if not isdir(self.dir):
             raise FileNotFoundError(f"Directory does not exist: {self.dir}")
-        for filename in os.listdir(self.dir):
-            file_path = join(self.dir, filename)
-            self._logger.info(f"Deleting {file_path}")
-            if isfile(file_path) or os.path.islink(file_path):
-                os.unlink(file_path)
-            elif isdir(file_path):
-                shutil.rmtree(file_path)
+        # Renaming the populated tree aside is a single atomic syscall;
+        # the thousands of unlinks then happen off the critical path
+        # while the rest of the build runs against the fresh directory.
+        trash = "{}.trash.{}.{}".format(self.dir, os.getpid(), time.time_ns())
+        self._logger.info(f"Moving {self.dir} to {trash} for background deletion")
+        os.rename(self.dir, trash)
+        os.makedirs(self.dir)
+        threading.Thread(target=shutil.rmtree, args=(trash, True), daemon=True).start()
 
 
 class CopyFilesBuildStep(BuildStep):
-    def __init__(self, logger, root, files, dest_dir, create_dest_dir=True, name=None, stop_on_fail=True):
+    __slots__ = ("files", "dest_dir", "create_dest_dir", "manifest", "root")
+    def __init__(self, logger, root, files, dest_dir, create_dest_dir=True, manifest=None, name=None, stop_on_fail=True):
         super().__init__(logger, name=name, stop_on_fail=stop_on_fail)
         self.files = files
         self.dest_dir = dest_dir
         self.create_dest_dir = create_dest_dir
+        self.manifest = manifest
         self.root = root
     
     def execute(self):
         copy_count = 0
-        if not isdir(self.dest_dir):
-            if self.create_dest_dir:
-                self._logger.info("Creating destination directory: {}".format(self.dest_dir))
-                os.makedirs(self.dest_dir)
-            else:
-                raise FileNotFoundError("Destination does not exist: {}".format(self.dest_dir))
-            
+        if self.create_dest_dir:
+            os.makedirs(self.dest_dir, exist_ok=True)
+        elif not isdir(self.dest_dir):
+            raise FileNotFoundError("Destination does not exist: {}".format(self.dest_dir))
+
+        # relpath splits and rejoins on every call, and sibling files
+        # overwhelmingly share a parent, so resolve each source parent to
+        # its destination directory once.
+        dest_parents = {}
         for file in self.files:
-            dest_filename = join(self.dest_dir, relpath(file, start=self.root))
-            self._logger.info("Copying {} to {}".format(file, dest_filename))
-            if not isdir(dirname(dest_filename)):
-                os.makedirs(dirname(dest_filename))
-            shutil.copy2(file, dest_filename)
-            copy_count += 1
-        self._logger.info(f"Copied {copy_count} files")
-
-  
+            parent = dirname(file)
+            if parent not in dest_parents:
+                dest_parents[parent] = normpath(join(self.dest_dir, relpath(parent, start=self.root)))
+        # Sort by inode so batches of small files are read roughly in
+        # on-disk layout order instead of directory order.
+        files = sorted(self.files, key=lambda f: os.stat(f).st_ino)
+        pairs = [(file, join(dest_parents[dirname(file)], basename(file))) for file in files]
+        skip_count = 0
+        if self.manifest is not None:
+            changed = []
+            for pair in pairs:
+                if self.manifest.is_unchanged(*pair):
+                    skip_count += 1
+                else:
+                    changed.append(pair)
+            pairs = changed
+        for dir_ in {dirname(dest_filename) for _, dest_filename in pairs}:
+            os.makedirs(dir_, exist_ok=True)
+        error_count = 0
+        # The copies are I/O-bound and independent, so fan them out over a
+        # thread pool; the sendfile/copyfileobj internals release the GIL.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 4) as executor:
+            futures = {}
+            for file, dest_filename in pairs:
+                self._logger.info("Copying {} to {}".format(file, dest_filename))
+                futures[executor.submit(_fast_copy, file, dest_filename)] = (file, dest_filename)
+            for future in concurrent.futures.as_completed(futures):
+                file, dest_filename = futures[future]
+                try:
+                    future.result()
+                    copy_count += 1
+                    if self.manifest is not None:
+                        self.manifest.record(file, dest_filename)
+                except OSError:
+                    self._logger.exception("Failed to copy {} to {}".format(file, dest_filename))
+                    error_count += 1
+        self._logger.info(f"Copied {copy_count} files, skipped {skip_count} unchanged")
+        self.result = error_count
+
+class WriteBytesBuildStep(BuildStep):
+    # Materializes in-memory content directly at its destination, saving
+    # the write-then-copy round-trip of a temporary source file.
+    __slots__ = ("path", "data")
+    def __init__(self, logger, path, data, **kwargs):
+        super().__init__(logger, **kwargs)
+        self.path = path
+        self.data = data
+
+    def execute(self):
+        self._logger.info("Writing {} bytes to {}".format(len(self.data), self.path))
+        os.makedirs(dirname(self.path), exist_ok=True)
+        with open(self.path, "wb") as file:
+            file.write(self.data)
+
+
+class ZipFilesBuildStep(BuildStep):
+    __slots__ = ("root", "source_dir", "zip_filename", "name_regex", "recursive", "compresslevel", "cache_dir")
+    # Level 1: the payload is mostly already-compressed jars, so higher
+    # levels burn CPU for no meaningful size win.
+    def __init__(self, logger, root, source_dir, zip_filename, name_regex=r".", recursive=True, compresslevel=1, cache_dir=None, name=None, stop_on_fail=True):
+        super().__init__(logger, name=name, stop_on_fail=stop_on_fail)
+        self.root = root
+        self.source_dir = source_dir
+        self.zip_filename = zip_filename
+        self.name_regex = name_regex
+        self.recursive = recursive
+        self.compresslevel = compresslevel
+        self.cache_dir = cache_dir
+
+    def _deflate(self, file, arcname):
+        zinfo = zipfile.ZipInfo.from_file(file, arcname)
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        with open(file, "rb") as f:
+            data = f.read()
+        zinfo.CRC = _zlib.crc32(data)
+        zinfo.file_size = len(data)
+        compressor = _zlib.compressobj(self.compresslevel, zlib.DEFLATED, -15)
+        data = compressor.compress(data) + compressor.flush()
+        zinfo.compress_size = len(data)
+        return zinfo, data
+
+    def _append_precompressed(self, z, zinfo, data):
+        # zipfile has no public API for appending already-deflated data,
+        # so write the local header and blob directly and register the
+        # entry for the central directory written on close.
+        self._logger.info("Zipping {}".format(zinfo.filename))
+        zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+        zinfo.header_offset = z.fp.tell()
+        z.fp.write(zinfo.FileHeader(zip64=zip64))
+        z.fp.write(data)
+        z.filelist.append(zinfo)
+        z.NameToInfo[zinfo.filename] = zinfo
+        z.start_dir = z.fp.tell()
+        z._didModify = True
+
+    def _iter_matches(self):
+        for file in _list_files(self.source_dir, self.name_regex, self.recursive):
+            yield file, relpath(file, start=self.root)
+
+    def _fingerprint(self, matches):
+        # Digest over every (arcname, content hash) pair in arcname
+        # order, so the key depends only on what would go into the zip.
+        h = _new_hash()
+        for file, arcname in sorted(matches, key=lambda match: match[1]):
+            h.update(arcname.encode())
+            h.update(_file_digest(file))
+        return h.hexdigest()
+
+    def execute(self):
+        zip_count = 0
+        matches = self._iter_matches()
+        cache_path = None
+        if self.cache_dir is not None:
+            matches = list(matches)
+            digest = self._fingerprint(matches)
+            cache_path = join(self.cache_dir, "{}.zip".format(digest))
+            if isfile(cache_path):
+                self._logger.info("Inputs unchanged ({}); reusing {}".format(digest[:12], cache_path))
+                _link_or_copy(cache_path, self.zip_filename)
+                return
+        # DEFLATE is CPU-bound and zlib releases the GIL, so compress the
+        # entries on a thread pool and append the precompressed blobs
+        # serially in submission order. Matches are consumed straight off
+        # the walk, and the in-flight window is bounded so completed
+        # blobs don't pile up in memory ahead of the writer.
+        max_pending = (os.cpu_count() or 1) * 2
+        pending = deque()
+        # The output may be a hardlink into the cache from an earlier
+        # build; opening it "w" would rewrite that shared inode in place
+        # and corrupt the cached entry under its old digest. Unlink first
+        # so the new archive lands on a fresh inode.
+        if isfile(self.zip_filename):
+            os.unlink(self.zip_filename)
+        with zipfile.ZipFile(self.zip_filename, "w", zipfile.ZIP_DEFLATED) as z:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+                for match in matches:
+                    pending.append(executor.submit(self._deflate, *match))
+                    if len(pending) > max_pending:
+                        self._append_precompressed(z, *pending.popleft().result())
+                        zip_count += 1
+                while pending:
+                    self._append_precompressed(z, *pending.popleft().result())
+                    zip_count += 1
+        self._logger.info(f"Zipped {zip_count} files to {self.zip_filename}")
+        if cache_path is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _link_or_copy(self.zip_filename, cache_path)
+
+
 def load_ignore_list(filename):
-    ignoreList = []
+    # Escaping first means the wildcard comes out as a literal r"\*",
+    # which maps straight to ".*" without the placeholder-token dance.
     with open(filename, "r") as file:
-        for line in file.readlines():
-            line = line.strip()
-            if line == "":
-                continue
-            line = line.replace("*", "__WILDCARD__")
-            line = re.escape(line)
-            line = line.replace("__WILDCARD__", ".*")
-            ignoreList.append(line)
-    return ignoreList
-
-def create_version_file(revision):
-    with open(REVISION_PATH, "w") as file:
-        file.write(revision)
- 
+        patterns = [re.escape(line.strip()).replace(r"\*", ".*") for line in file if line.strip()]
+    # An empty alternation would match everything; no patterns means
+    # ignore nothing, so compile a never-matching regex instead.
+    if not patterns:
+        return re.compile(r"(?!)")
+    # One alternation matches all patterns in a single pass instead of
+    # one re.search per pattern per filename.
+    return re.compile("|".join(patterns))
+
 def get_mod_list(mod_dict, keys):
     mod_list = []
     for key in keys:
@@ -115,15 +452,13 @@ def get_mod_list(mod_dict, keys):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser("build.py")
     parser.add_argument("--revision", type=str.lower, default="dirty")
+    parser.add_argument("--clean", action="store_true", help="wipe the build directory instead of building incrementally")
 
     args = parser.parse_args(sys.argv[1:])
     revision = args.revision
 
-    if not isdir(BUILD_DIR):
-        os.makedirs(BUILD_DIR)
-
-    if not isdir(LOG_DIR):
-        os.makedirs(LOG_DIR)
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    os.makedirs(LOG_DIR, exist_ok=True)
 
     log_filename = join(LOG_DIR, LOG_FILENAME)
     logger = logging.getLogger("build")
@@ -142,17 +477,17 @@ if __name__ == "__main__":
     numErrors = 0
     buildFailed = False
     
-    # Clean
-    build_steps.append(CleanBuildStep(logger, BUILD_DIR, name="Clean build directory"))
-    
-    # Create revision.txt file
-    build_steps.append(GenericBuildStep(logger, lambda: create_version_file(revision), name="Create revision file"))
-    
-    bin_files = glob.glob(join(BIN_DIR, "*.*"))
-    mod_files = glob.glob(join(MOD_DIR, "*.*"))
-    client_files = glob.glob(join(ROOT_DIR, "client", "**/*.*"))
-    server_files = glob.glob(join(ROOT_DIR, "server", "**/*.*"))
-    revision_files = [join(REVISION_DIR, REVISION_FILENAME)]
+    # Clean. Normally the manifest skips unchanged files instead; a clean
+    # build is only done on request. is_unchanged also checks that the
+    # destination exists, so a stale manifest cannot mask a wiped tree.
+    if args.clean:
+        build_steps.append(CleanBuildStep(logger, BUILD_DIR, name="Clean build directory"))
+    manifest = IncrementalManifest(logger, MANIFEST_PATH)
+
+    bin_files = _list_files(BIN_DIR, r"\.", recursive=False)
+    mod_files = _list_files(MOD_DIR, r"\.", recursive=False)
+    client_files = _list_files(join(ROOT_DIR, "client"), r"\.")
+    server_files = _list_files(join(ROOT_DIR, "server"), r"\.")
 
     client_dir = join(ROOT_DIR, "client")
     server_dir = join(ROOT_DIR, "server")
@@ -161,17 +496,30 @@ if __name__ == "__main__":
     server_package_dir = join(BUILD_DIR, "server")
 
     # Package client
-    build_steps.append(CopyFilesBuildStep(logger, REVISION_DIR, revision_files, client_package_dir, name="Copy revision file"))
-    build_steps.append(CopyFilesBuildStep(logger, client_dir, client_files, client_package_dir, name="Copy client"))
-    build_steps.append(CopyFilesBuildStep(logger, ROOT_DIR, bin_files, client_package_dir, name="Copy bin/ to client"))
-    build_steps.append(CopyFilesBuildStep(logger, ROOT_DIR, mod_files, client_package_dir, name="Copy mods/ to client"))
+    build_steps.append(CopyFilesBuildStep(logger, client_dir, client_files, client_package_dir, manifest=manifest, name="Copy client"))
+    build_steps.append(CopyFilesBuildStep(logger, ROOT_DIR, bin_files, client_package_dir, manifest=manifest, name="Copy bin/ to client"))
+    build_steps.append(CopyFilesBuildStep(logger, ROOT_DIR, mod_files, client_package_dir, manifest=manifest, name="Copy mods/ to client"))
 
     # Package server
-    build_steps.append(CopyFilesBuildStep(logger, REVISION_DIR, revision_files, server_package_dir, name="Copy revision file"))
-    build_steps.append(CopyFilesBuildStep(logger, server_dir, server_files, server_package_dir, name="Copy server"))
-    build_steps.append(CopyFilesBuildStep(logger, BIN_DIR, bin_files, server_package_dir, name="Copy bin/ to server"))
-    build_steps.append(CopyFilesBuildStep(logger, ROOT_DIR, mod_files, server_package_dir, name="Copy mods/ to server"))
-       
+    build_steps.append(CopyFilesBuildStep(logger, server_dir, server_files, server_package_dir, manifest=manifest, name="Copy server"))
+    build_steps.append(CopyFilesBuildStep(logger, BIN_DIR, bin_files, server_package_dir, manifest=manifest, name="Copy bin/ to server"))
+    build_steps.append(CopyFilesBuildStep(logger, ROOT_DIR, mod_files, server_package_dir, manifest=manifest, name="Copy mods/ to server"))
+
+    # Persist the manifest and remove destinations whose source vanished
+    build_steps.append(GenericBuildStep(logger, manifest.finalize, name="Update build manifest"))
+
+    # Write revision.txt straight into each package; it changes every
+    # build, so routing it through the manifest would be wasted work
+    # (and writing after finalize keeps the prune from touching it).
+    build_steps.append(WriteBytesBuildStep(logger, join(client_package_dir, REVISION_FILENAME), revision.encode(), name="Write client revision file"))
+    build_steps.append(WriteBytesBuildStep(logger, join(server_package_dir, REVISION_FILENAME), revision.encode(), name="Write server revision file"))
+
+    # Zip packages
+    client_zip_path = join(BUILD_DIR, "client-{}.zip".format(revision))
+    server_zip_path = join(BUILD_DIR, "server-{}.zip".format(revision))
+    build_steps.append(ZipFilesBuildStep(logger, client_package_dir, client_package_dir, client_zip_path, cache_dir=ZIP_CACHE_DIR, name="Zip client package"))
+    build_steps.append(ZipFilesBuildStep(logger, server_package_dir, server_package_dir, server_zip_path, cache_dir=ZIP_CACHE_DIR, name="Zip server package"))
+
     try:
         logger.info("Root directory: {}".format(ROOT_DIR))
         for build_step in build_steps: